@@ -1,5 +1,8 @@
 """arrayfile - Memory-mapped array implementation for efficient file-backed arrays."""
 
 from .array import Array
+from .bits import BitArray
+from .compressed import CompressedArray
+from .record import RecordArray
 
-__all__ = ["Array"]
+__all__ = ["Array", "BitArray", "CompressedArray", "RecordArray"]
@@ -0,0 +1,34 @@
+"""Optional numba kernels for bulk operations on numeric arrays."""
+
+import functools
+import importlib.util
+
+# numba takes a few hundred milliseconds to import, so look for it without importing it, and
+# only compile the kernels when they're first used
+available = importlib.util.find_spec("numba") is not None
+
+
+def supports(dtype):
+    """Return True if the kernels can run on numpy arrays of the given dtype."""
+    # numba only handles native byte order, and has no float16 arithmetic
+    return available and dtype.isnative and dtype.char != "e"
+
+
+@functools.cache
+def _compiled():
+    """Import numba and compile the kernels, once."""
+    from numba import njit
+
+    @njit(cache=True, nogil=True)
+    def contains(values, value):
+        """Return True as soon as value is found in values, unlike numpy which compares everything."""
+        for item in values:
+            if item == value:
+                return True
+        return False
+
+    return contains
+
+
+def contains(values, value):
+    return _compiled()(values, value)
@@ -1,14 +1,62 @@
+import contextlib
+import errno
+import functools
+import itertools
 import mmap
+import operator
 import os
 import struct
+import sys
 import tempfile
 import threading
 import weakref
 
+from . import _kernels
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, it just makes bulk operations faster
+    np = None
+
+# madvise() hints, on platforms that have them
+_MADV_RANDOM = getattr(mmap, "MADV_RANDOM", None)
+_MADV_SEQUENTIAL = getattr(mmap, "MADV_SEQUENTIAL", None)
+_MADV_DONTNEED = getattr(mmap, "MADV_DONTNEED", None)
+
+
+@functools.lru_cache(maxsize=64)
+def _bulk_struct(dtype, count):
+    """Return a cached Struct that packs count consecutive elements of dtype."""
+    prefix, code = "", dtype
+    if dtype[:1] in "@=<>!":
+        prefix, code = dtype[0], dtype[1:]
+
+    # A repeat count keeps the compiled Struct small, but only works for single codes, and not for
+    # strings, where a count is the length of one string ("3s" is one string, not three)
+    if len(code) == 1 and code not in "sp":
+        return struct.Struct(f"{prefix}{count}{code}")
+    return struct.Struct(prefix + code * count)
+
 
 class Array:
     CHUNK_SIZE_BYTES = 4096
 
+    # Map at least this many bytes up front, so appends rarely need to remap. Only on
+    # 64-bit Linux, where the unused tail is a sparse hole; close() truncates it away.
+    RESERVE_BYTES = 1 << 30 if sys.platform.startswith("linux") and sys.maxsize > 2**32 else 0
+
+    # How extend() writes its data: through the mapping, or with pwrite(2) straight to the file
+    BULK_MODES = ("mmap", "pwrite")
+
+    # extend() packs and writes iterables this many elements at a time, to bound its memory use
+    EXTEND_BATCH_ELEMENTS = 8192
+
+    # Bulk operations smaller than this aren't worth a pair of madvise() calls
+    ADVISE_MIN_BYTES = 1 << 20
+
+    # Arrays smaller than this are scanned with numpy, as loading the numba kernels costs far more
+    KERNEL_MIN_ELEMENTS = 1 << 20
+
     # Header constants
     MAGIC = b"ARYF"
     HEADER_VERSION = 1
@@ -16,9 +64,51 @@ class Array:
     HEADER_FORMAT = (
         "<4sHB8sIQ5x"  # magic(4), version(2), dtype_len(1), dtype(8), element_size(4), length(8), reserved(5)
     )
+    _header_struct = struct.Struct(HEADER_FORMAT)
+
+    # struct codes that have a numpy equivalent of the same size, and their numpy kind
+    _NP_KINDS = {
+        "b": "i",
+        "B": "u",
+        "h": "i",
+        "H": "u",
+        "i": "i",
+        "I": "u",
+        "l": "i",
+        "L": "u",
+        "q": "i",
+        "Q": "u",
+        "e": "f",
+        "f": "f",
+        "d": "f",
+    }
+    _NP_BYTE_ORDERS = {"@": "=", "=": "=", "<": "<", ">": ">", "!": ">"}
+
+    def __new__(cls, dtype=None, *args, compressed=False, **kwargs):
+        # Packed bits and compressed chunks need their own implementations. Subclasses may
+        # default their dtype, so a missing one is left for __init__ to complain about.
+        if cls is Array and dtype == "bit":
+            from .bits import BitArray
+
+            cls = BitArray
+        elif cls is Array and compressed:
+            from .compressed import CompressedArray
+
+            cls = CompressedArray
+        return super().__new__(cls)
+
+    def __init__(self, dtype, filename=None, mode="r+b", initial_elements=0, bulk_mode="mmap", *, compressed=False):
+        # compressed=True is handled by __new__, which returns a CompressedArray instead
+        self._check_bulk_mode(bulk_mode)
 
-    def __init__(self, dtype, filename=None, mode="r+b", initial_elements=0):
         self._lock = threading.Lock()
+        self._bulk_mode = bulk_mode
+
+        # Bulk reads export buffers from the mapping, which would stop it being resized, so
+        # they're counted in and out and remapping waits for them (see _reading and _remapping)
+        self._readers_changed = threading.Condition()
+        self._readers = 0
+        self._remapping = False
 
         if filename is None:
             fd, filename = tempfile.mkstemp()
@@ -26,9 +116,7 @@ class Array:
             mode = "w+b"  # Always create new temp files
 
         self._filename = filename
-        self._dtype = dtype
-        self._dtype_format = dtype
-        self._element_size = struct.calcsize(dtype)
+        self._setup_dtype(dtype)
         self._file = None
         self._mmap = None
         self._len = 0
@@ -36,12 +124,12 @@ class Array:
         self._capacity_bytes = 0  # Initialize _capacity_bytes here
         self._data_offset = self.HEADER_SIZE  # All data starts after header
 
-        if "w" in mode or not os.path.exists(filename):
+        create = "w" in mode or not os.path.exists(filename)
+        if create:
             # Create or truncate file
             self._file = open(filename, "w+b")
             self._len = 0
             self._allocate_capacity(initial_elements)
-            self._write_header()
         else:
             # Open existing file
             self._file = open(filename, mode)
@@ -52,34 +140,123 @@ class Array:
             data_size = current_file_size - self.HEADER_SIZE
 
             # Calculate capacity based on current data size and ensure chunk alignment
-            min_elements = (data_size + self._element_size - 1) // self._element_size
+            min_elements = self._count(data_size + self._nbytes(1) - 1)
             self._allocate_capacity(min_elements)
 
         # Only mmap if the file has a non-zero size
         if self._capacity_bytes > 0:
-            self._mmap = mmap.mmap(self._file.fileno(), 0)
+            self._map()
+
+        if create:
+            self._write_header()
 
         # Set up finalizer to ensure cleanup even if close() isn't called
         self._finalizer = weakref.finalize(self, self.close)
 
+    def _check_bulk_mode(self, bulk_mode):
+        """Make sure bulk_mode is one we know and this platform supports."""
+        if bulk_mode not in self.BULK_MODES:
+            raise ValueError(f"Unknown bulk_mode '{bulk_mode}', expected one of {', '.join(self.BULK_MODES)}")
+        if bulk_mode == "pwrite" and not hasattr(os, "pwrite"):
+            raise ValueError("bulk_mode 'pwrite' is not available on this platform")
+
+    def _setup_dtype(self, dtype):
+        """Set up packing and element sizes for the dtype."""
+        self._dtype = dtype
+        self._dtype_format = dtype
+        self._struct = struct.Struct(dtype)
+        self._pack = self._struct.pack
+        self._unpack_from = self._struct.unpack_from
+        self._element_size = self._struct.size
+        self._np_dtype = self._numpy_dtype()
+        self._use_kernels = self._np_dtype is not None and _kernels.supports(self._np_dtype)
+
+    def _nbytes(self, count):
+        """Return the number of bytes needed to store count elements."""
+        return count * self._element_size
+
+    def _count(self, nbytes):
+        """Return the number of elements that fit in nbytes."""
+        return nbytes // self._element_size
+
     def __len__(self):
         return self._len
 
     def __iter__(self):
-        current_len = self._len
-        for i in range(current_len):
-            yield self[i]
+        # Snapshot the length, then copy the data out a block at a time rather than holding a
+        # view, so the array can grow while we iterate without all of it being held in memory
+        length = self._len
+        with self._sequential(self._data_offset, self._nbytes(length)):
+            for start in range(0, length, self.EXTEND_BATCH_ELEMENTS):
+                count = min(self.EXTEND_BATCH_ELEMENTS, length - start)
+                mapped = self._mmap
+                if mapped is None:
+                    raise RuntimeError("Array is not memory-mapped. This should not happen if len > 0.")
+
+                offset = self._data_offset + start * self._element_size
+                if self._np_dtype is not None:
+                    with self._reading():
+                        values = np.frombuffer(mapped, dtype=self._np_dtype, count=count, offset=offset).tolist()
+                    yield from values
+                else:
+                    block = mapped[offset : offset + count * self._element_size]
+                    yield from (value for (value,) in self._struct.iter_unpack(block))
+
+    def __buffer__(self, flags):
+        return self.memoryview()
+
+    def asarray(self):
+        """Return a numpy array that shares memory with the file, without copying.
+
+        Writes to the returned array go straight to the file. The view keeps the
+        length the array had when it was taken, and pins the mapping: growing past
+        the mapped capacity raises BufferError until it is released, and so does
+        closing the array.
+        """
+        if np is None:
+            raise ImportError("numpy is required for asarray()")
+        if self._np_dtype is None:
+            raise TypeError(f"dtype '{self._dtype}' has no numpy equivalent")
+
+        if not self._mmap:
+            if self._len:
+                raise RuntimeError("Array is not memory-mapped. This should not happen if len > 0.")
+            return np.empty(0, dtype=self._np_dtype)
+
+        return np.frombuffer(self._mmap, dtype=self._np_dtype, count=self._len, offset=self._data_offset)
+
+    def memoryview(self):
+        """Return a memoryview of the data that shares memory with the file.
+
+        Native dtypes are cast to their own format, anything else is viewed as
+        raw bytes. Like asarray(), the view must be released before the array
+        is closed.
+        """
+        if not self._mmap:
+            if self._len:
+                raise RuntimeError("Array is not memory-mapped. This should not happen if len > 0.")
+            return memoryview(b"")
+
+        end = self._data_offset + self._nbytes(self._len)
+        view = memoryview(self._mmap)[self._data_offset : end]
+        try:
+            return view.cast(self._dtype)
+        except (TypeError, ValueError):
+            return view
 
     def _validate_index(self, index):
         """Validate and normalize an index, returning the normalized value."""
-        if not isinstance(index, int):
-            raise TypeError("Index must be an integer")
+        try:
+            index = operator.index(index)
+        except TypeError:
+            raise TypeError("Index must be an integer") from None
 
         # Handle negative indices
+        length = self._len
         if index < 0:
-            index = self._len + index
+            index += length
 
-        if not (0 <= index < self._len):
+        if index < 0 or index >= length:
             raise IndexError("Index out of bounds")
 
         return index
@@ -87,28 +264,63 @@ class Array:
     def _pack_value(self, value):
         """Pack a value into bytes according to the dtype format."""
         try:
-            return struct.pack(self._dtype_format, value)
+            return self._pack(value)
         except struct.error as e:
             raise TypeError(f"Value {value} cannot be packed as {self._dtype_format}: {e}")
 
+    def _pack_values(self, values):
+        """Pack a sequence of values into one contiguous block of bytes."""
+        try:
+            return _bulk_struct(self._dtype_format, len(values)).pack(*values)
+        except struct.error as e:
+            raise TypeError(f"Values cannot be packed as {self._dtype_format}: {e}")
+
+    def _pack_array(self, values):
+        """Pack a 1-d numpy array into bytes, converting it to our dtype."""
+        if values.ndim != 1:
+            raise TypeError(f"Only 1-d arrays can be packed, got {values.ndim} dimensions")
+
+        # numpy won't cast between signed and unsigned ints, so range check those ourselves
+        casting = "same_kind"
+        if values.dtype.kind in "biu" and self._np_dtype.kind in "iu":
+            info = np.iinfo(self._np_dtype)
+            if values.size and (values.min() < info.min or values.max() > info.max):
+                raise TypeError(f"Array values cannot be packed as {self._dtype_format}: out of range")
+            casting = "unsafe"
+
+        try:
+            return values.astype(self._np_dtype, casting=casting, copy=False).tobytes()
+        except TypeError as e:
+            raise TypeError(f"Array of {values.dtype} cannot be packed as {self._dtype_format}: {e}")
+
+    def _numpy_dtype(self):
+        """Return the numpy dtype with the same layout as our struct dtype, or None."""
+        if np is None:
+            return None
+
+        order, code = "@", self._dtype
+        if code[:1] in self._NP_BYTE_ORDERS:
+            order, code = code[0], code[1:]
+
+        kind = self._NP_KINDS.get(code)
+        if kind is None:
+            return None
+
+        return np.dtype(f"{self._NP_BYTE_ORDERS[order]}{kind}{self._element_size}")
+
     def _write_header(self):
-        """Write header to the beginning of the file."""
+        """Write header to the beginning of the file, through the mmap if there is one."""
         dtype_bytes = self._dtype.encode("ascii")[:8]  # Limit to 8 bytes
         dtype_bytes = dtype_bytes.ljust(8, b"\x00")  # Pad with nulls
 
-        header = struct.pack(
-            self.HEADER_FORMAT,
-            self.MAGIC,
-            self.HEADER_VERSION,
-            len(self._dtype),
-            dtype_bytes,
-            self._element_size,
-            self._len,
-        )
+        fields = (self.MAGIC, self.HEADER_VERSION, len(self._dtype), dtype_bytes, self._element_size, self._len)
+
+        if self._mmap:
+            self._header_struct.pack_into(self._mmap, 0, *fields)
+            return
 
         self._file.seek(0)
-        self._file.write(header)
-        self._file.flush()
+        self._file.write(self._header_struct.pack(*fields))
 
     def _read_header(self):
         """Read and validate header from file. Returns True if valid header, False if no header."""
@@ -118,7 +330,7 @@ class Array:
         if len(header_data) < self.HEADER_SIZE:
             return False
 
-        magic, version, dtype_len, dtype_bytes, element_size, length = struct.unpack(self.HEADER_FORMAT, header_data)
+        magic, version, dtype_len, dtype_bytes, element_size, length = self._header_struct.unpack(header_data)
 
         if magic != self.MAGIC:
             return False
@@ -140,57 +352,261 @@ class Array:
         return True
 
     def __getitem__(self, index):
-        index = self._validate_index(index)
+        # This is the hot path, so _validate_index is inlined and attributes are read once
+        try:
+            index = operator.index(index)
+        except TypeError:
+            if isinstance(index, slice):
+                return self._get_slice(index)
+            raise TypeError("Index must be an integer") from None
 
-        if not self._mmap:
+        length = self._len
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError("Index out of bounds")
+
+        mapped = self._mmap
+        if mapped is None:
             raise RuntimeError("Array is not memory-mapped. This should not happen if len > 0.")
 
-        offset = self._data_offset + index * self._element_size
-        data = self._mmap[offset : offset + self._element_size]
-        return struct.unpack(self._dtype_format, data)[0]
+        return self._unpack_from(mapped, self._data_offset + index * self._element_size)[0]
+
+    def _get_slice(self, index):
+        """Read a slice in bulk, as a numpy array if numpy is available or a list if not."""
+        positions = range(*index.indices(self._len))
+        if not positions:
+            return [] if self._np_dtype is None else np.empty(0, dtype=self._np_dtype)
+
+        if self._mmap is None:
+            raise RuntimeError("Array is not memory-mapped. This should not happen if len > 0.")
+
+        # Read the whole span covered by the slice in one go, then pick out the steps
+        low = min(positions[0], positions[-1])
+        count = max(positions[0], positions[-1]) + 1 - low
+        offset = self._data_offset + low * self._element_size
+        picked = slice(positions[0] - low, None, positions.step)
+
+        with self._sequential(offset, count * self._element_size):
+            if self._np_dtype is not None:
+                # Copy without keeping the view, which would hold the mapping past _reading()
+                with self._reading():
+                    values = np.frombuffer(self._mmap, dtype=self._np_dtype, count=count, offset=offset)[picked].copy()
+                return values
+
+            if abs(positions.step) == 1:
+                return list(_bulk_struct(self._dtype_format, count).unpack_from(self._mmap, offset)[picked])
+
+        # Unpacking the whole span would build an object for every element we skip over
+        mapped = self._mmap
+        size = self._element_size
+        return [self._unpack_from(mapped, self._data_offset + position * size)[0] for position in positions]
+
+    def _set_slice(self, index, values):
+        """Overwrite a slice in bulk. The number of values must match, as arrays can't be resized by slicing."""
+        positions = range(*index.indices(self._len))
+
+        if self._np_dtype is not None and isinstance(values, np.ndarray):
+            packed_values = self._pack_array(values)
+        else:
+            packed_values = self._pack_values(list(values))
+
+        count = len(packed_values) // self._element_size
+        if count != len(positions):
+            raise ValueError(
+                f"Cannot assign {count} values to a slice of {len(positions)}, arrays don't support inserts"
+            )
+
+        if not positions:
+            return
+
+        # Like __setitem__, this only overwrites existing elements, so it doesn't need the lock
+        mapped = self._mmap
+        if mapped is None:
+            raise RuntimeError("Array is not memory-mapped. This should not happen if len > 0.")
+
+        size = self._element_size
+        low = self._data_offset + min(positions[0], positions[-1]) * size
+        span = (abs(positions[-1] - positions[0]) + 1) * size
+        with self._sequential(low, span):
+            if positions.step == 1:
+                mapped[low : low + len(packed_values)] = packed_values
+                return
+
+            for i, position in enumerate(positions):
+                offset = self._data_offset + position * size
+                mapped[offset : offset + size] = packed_values[i * size : (i + 1) * size]
 
     def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self._set_slice(index, value)
+            return
+
         index = self._validate_index(index)
 
-        with self._lock:
-            if not self._mmap:
-                raise RuntimeError("Array is not memory-mapped. This should not happen if len > 0.")
+        # Overwriting an existing element doesn't need the lock: the byte range is fixed, and
+        # an old mapping swapped out by a concurrent resize still writes to the same file pages.
+        mapped = self._mmap
+        if mapped is None:
+            raise RuntimeError("Array is not memory-mapped. This should not happen if len > 0.")
 
-            offset = self._data_offset + index * self._element_size
-            packed_value = self._pack_value(value)
-            self._mmap[offset : offset + self._element_size] = packed_value
+        offset = self._data_offset + index * self._element_size
+        mapped[offset : offset + self._element_size] = self._pack_value(value)
 
     def append(self, value):
+        packed_value = self._pack_value(value)
+
         with self._lock:
             if self._len == self._capacity:
                 self._resize(self._len + 1)
 
             offset = self._data_offset + self._len * self._element_size
-            packed_value = self._pack_value(value)
-
             self._mmap[offset : offset + self._element_size] = packed_value
             self._len += 1
 
     def _allocate_capacity(self, min_elements):
         """Allocate capacity for at least min_elements, rounded up to chunk boundary."""
-        bytes_needed = min_elements * self._element_size + self.HEADER_SIZE
+        bytes_needed = max(self._nbytes(min_elements) + self.HEADER_SIZE, self.RESERVE_BYTES)
         chunks_needed = (bytes_needed + self.CHUNK_SIZE_BYTES - 1) // self.CHUNK_SIZE_BYTES
         total_file_size = chunks_needed * self.CHUNK_SIZE_BYTES
         self._capacity_bytes = total_file_size - self.HEADER_SIZE
-        self._capacity = self._capacity_bytes // self._element_size
+        self._capacity = self._count(self._capacity_bytes)
         self._file.truncate(total_file_size)
 
     def _resize(self, min_new_len):
-        if self._mmap:
-            self._mmap.close()
+        with self._remapping_lock():
+            self._grow(min_new_len)
+
+    def _grow(self, min_new_len):
+        # Grow geometrically so repeated appends only remap O(log n) times
+        new_capacity = max(min_new_len, self._capacity * 2)
 
-        self._allocate_capacity(min_new_len)
+        if self._mmap:
+            # Grow the existing mapping in place (mremap) where the platform allows it
+            capacity, capacity_bytes = self._capacity, self._capacity_bytes
+            try:
+                self._allocate_capacity(new_capacity)
+                self._mmap.resize(self.HEADER_SIZE + self._capacity_bytes)
+                return
+            except BufferError:
+                # Views handed out by asarray() or memoryview() are pinning the mapping. Remapping
+                # would leave them on an old mapping that a later truncate could pull the file out
+                # from under, so refuse to grow instead.
+                self._capacity, self._capacity_bytes = capacity, capacity_bytes
+                raise
+            except SystemError:
+                # There's no mremap. Map the file again and leave the old mapping alone: it is
+                # unmapped once the last reference to it goes, so a concurrent reader that still
+                # holds it never sees it closed underneath it.
+                pass
+            except OSError:
+                # Windows can't grow a file while it's mapped
+                self._mmap.close()
+
+        self._allocate_capacity(new_capacity)
+        self._map()
+
+    @contextlib.contextmanager
+    def _reading(self):
+        """Count a bulk read in and out, so the mapping isn't remapped while it holds a buffer."""
+        with self._readers_changed:
+            while self._remapping:
+                self._readers_changed.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._readers_changed:
+                self._readers -= 1
+                self._readers_changed.notify_all()
+
+    @contextlib.contextmanager
+    def _remapping_lock(self):
+        """Wait for bulk reads to finish, and hold new ones off, while the mapping is resized or closed.
+
+        The caller must hold the lock, so only one thread remaps at a time.
+        """
+        with self._readers_changed:
+            self._remapping = True
+            while self._readers:
+                self._readers_changed.wait()
+        try:
+            yield
+        finally:
+            with self._readers_changed:
+                self._remapping = False
+                self._readers_changed.notify_all()
+
+    def _map(self):
+        """Map the whole file, expecting random access until told otherwise."""
         self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self._advise(_MADV_RANDOM)
+
+    def _advise(self, option, start=0, length=None):
+        """Pass an access pattern hint for a byte range of the mapping to the kernel, if possible."""
+        if option is None or not self._mmap:
+            return
+
+        # madvise() wants a page aligned start
+        aligned_start = start - start % mmap.PAGESIZE
+        end = len(self._mmap) if length is None else min(start + length, len(self._mmap))
+        if end > aligned_start:
+            self._mmap.madvise(option, aligned_start, end - aligned_start)
+
+    def _pwrite(self, data, offset):
+        """Write data to the file at offset, bypassing the mapping. The page cache is shared, so the mapping sees it."""
+        remaining = memoryview(data)
+        while remaining:
+            written = os.pwrite(self._file.fileno(), remaining, offset)
+            remaining = remaining[written:]
+            offset += written
+
+    def _preallocate(self, offset, length):
+        """Allocate disk blocks for a byte range we're about to fill, so it isn't written as sparse holes.
+
+        Running out of space here raises OSError, rather than SIGBUS when the mapped pages are written back.
+        """
+        if length < mmap.PAGESIZE or not hasattr(os, "posix_fallocate"):
+            return
+
+        try:
+            os.posix_fallocate(self._file.fileno(), offset, length)
+        except OSError as e:
+            # Not every filesystem can do it, which is fine, it's only an optimization
+            if e.errno not in (errno.EINVAL, errno.EOPNOTSUPP, errno.ENOSYS):
+                raise
+
+    @contextlib.contextmanager
+    def _sequential(self, start, length):
+        """Hint sequential access over a byte range for the duration of a bulk operation."""
+        if length < self.ADVISE_MIN_BYTES:
+            yield
+            return
+
+        self._advise(_MADV_SEQUENTIAL, start, length)
+        try:
+            yield
+        finally:
+            self._advise(_MADV_RANDOM, start, length)
+
+    def _batches(self, iterable):
+        """Yield lists of up to EXTEND_BATCH_ELEMENTS values from an iterable, without materializing all of it."""
+        iterator = iter(iterable)
+        while batch := list(itertools.islice(iterator, self.EXTEND_BATCH_ELEMENTS)):
+            yield batch
 
     def extend(self, iterable):
-        values = list(iterable)
-        num_new_elements = len(values)
+        # Like list.extend, if a batch can't be packed, the batches before it have already been added
+        if self._np_dtype is not None and isinstance(iterable, np.ndarray):
+            self._extend_packed(self._pack_array(iterable))
+            return
 
+        for batch in self._batches(iterable):
+            self._extend_packed(self._pack_values(batch))
+
+    def _extend_packed(self, packed_values):
+        """Add already packed values to the end of the array."""
+        num_new_elements = len(packed_values) // self._element_size
         if num_new_elements == 0:
             return
 
@@ -199,19 +615,35 @@ class Array:
             if new_len > self._capacity:
                 self._resize(new_len)
 
-            # Batch write all values directly to mmap
+            # Write the whole batch in one go
             offset = self._data_offset + self._len * self._element_size
-            for value in values:
-                packed_value = self._pack_value(value)
-                self._mmap[offset : offset + self._element_size] = packed_value
-                offset += self._element_size
+            if self._bulk_mode == "pwrite":
+                self._pwrite(packed_values, offset)
+            else:
+                self._preallocate(offset, len(packed_values))
+                with self._sequential(offset, len(packed_values)):
+                    self._mmap[offset : offset + len(packed_values)] = packed_values
 
             self._len = new_len
 
     def __contains__(self, value):
-        for i in range(self._len):
-            if self[i] == value:
-                return True
+        if self._np_dtype is not None and isinstance(value, (int, float)):
+            # Convert once, so values that can't be stored exactly can't match
+            try:
+                item = self._np_dtype.type(value)
+            except (OverflowError, ValueError):
+                return False
+            if item.item() != value:
+                return False
+            with self._sequential(self._data_offset, self._nbytes(self._len)), self._reading():
+                if self._use_kernels and self._len >= self.KERNEL_MIN_ELEMENTS:
+                    return _kernels.contains(self.asarray(), item)
+                return bool((self.asarray() == item).any())
+
+        with self._sequential(self._data_offset, self._nbytes(self._len)), self._reading(), self.memoryview() as view:
+            for (item,) in self._struct.iter_unpack(view):
+                if item == value:
+                    return True
         return False
 
     def __iadd__(self, other):
@@ -226,10 +658,12 @@ class Array:
 
         with self._lock:
             if value == 0:
-                self._len = 0
+                # Unmap first: a live view makes this raise BufferError, and the array must be left intact
                 if self._mmap:
-                    self._mmap.close()
+                    with self._remapping_lock():
+                        self._mmap.close()
                     self._mmap = None
+                self._len = 0
                 if self._file:
                     self._file.truncate(0)
                 self._capacity = 0
@@ -242,15 +676,16 @@ class Array:
                 if new_total_len > self._capacity:
                     self._resize(new_total_len)
 
-                # Copy data in-place
-                src_offset = self._data_offset
-                dst_offset = self._data_offset + original_len * self._element_size
+                # Copy data in-place, doubling the populated region each time
+                start = self._data_offset
+                total = self._nbytes(new_total_len)
+                written = self._nbytes(original_len)
 
-                for _ in range(value - 1):
-                    # Copy the original data chunk
-                    chunk_size = original_len * self._element_size
-                    self._mmap[dst_offset : dst_offset + chunk_size] = self._mmap[src_offset : src_offset + chunk_size]
-                    dst_offset += chunk_size
+                with self._sequential(start, total):
+                    while written < total:
+                        chunk_size = min(written, total - written)
+                        self._mmap.move(start + written, start, chunk_size)
+                        written += chunk_size
 
                 self._len = new_total_len
         return self
@@ -259,23 +694,31 @@ class Array:
         if self._mmap:
             self._mmap.flush()
 
-    def close(self):
+    def close(self, sync=False):
+        """Write the header, unmap and truncate the file to its data. With sync=True, fsync it too."""
+        if self._file:
+            # Update header with final length
+            self._write_header()
+
         if self._mmap:
-            # Ensure all writes are on disk before truncating
+            # Ensure all writes are on disk before truncating, then drop the unused tail
             self._mmap.flush()
+            self._advise(_MADV_DONTNEED, self._data_offset + self._nbytes(self._len))
             self._mmap.close()
             self._mmap = None
 
         if self._file:
-            # Update header with final length
-            self._write_header()
+            # The header goes through the file if there was no mapping
+            self._file.flush()
 
             # Only truncate if the file was opened in a writable mode
             # and if the current size is greater than the actual data length
             current_file_size = os.fstat(self._file.fileno()).st_size
-            actual_total_size = self.HEADER_SIZE + self._len * self._element_size
+            actual_total_size = self.HEADER_SIZE + self._nbytes(self._len)
             if current_file_size > actual_total_size:
                 self._file.truncate(actual_total_size)
+            if sync:
+                os.fsync(self._file.fileno())
             self._file.close()
             self._file = None
 
@@ -0,0 +1,201 @@
+from . import array
+from .array import Array
+
+
+class BitArray(Array):
+    """An Array of booleans packed 8 to a byte, least significant bit first.
+
+    Created with Array("bit"). Uses an eighth of the space of a "B" array, so
+    scans read an eighth of the pages. Values are stored by truthiness and read
+    back as bools.
+    """
+
+    DTYPE = "bit"
+
+    # `in` compares the data this many bytes at a time
+    SCAN_BLOCK_BYTES = 1 << 16
+
+    def __init__(
+        self, dtype=DTYPE, filename=None, mode="r+b", initial_elements=0, bulk_mode="mmap", *, compressed=False
+    ):
+        if compressed:
+            raise ValueError("Bit arrays can't be compressed")
+        super().__init__(dtype, filename, mode, initial_elements, bulk_mode)
+
+    def _setup_dtype(self, dtype):
+        if dtype != self.DTYPE:
+            raise ValueError(f"BitArray dtype must be '{self.DTYPE}', got '{dtype}'")
+
+        self._dtype = dtype
+        self._dtype_format = dtype
+        self._struct = None
+        self._element_size = 1  # bytes are the unit of storage, see _nbytes
+        self._np_dtype = None
+        self._use_kernels = False
+
+    def _nbytes(self, count):
+        return (count + 7) // 8
+
+    def _count(self, nbytes):
+        return nbytes * 8
+
+    def _pack_bits(self, bits):
+        """Pack a sequence of bools into bytes, padding the last byte with zeros."""
+        if array.np is not None:
+            return array.np.packbits(array.np.asarray(bits, dtype=bool), bitorder="little").tobytes()
+
+        packed = bytearray(self._nbytes(len(bits)))
+        for i, bit in enumerate(bits):
+            if bit:
+                packed[i >> 3] |= 1 << (i & 7)
+        return bytes(packed)
+
+    def _unpack_bits(self, start, end):
+        """Unpack the bytes from start to end of the data into bools, as a numpy array or a list."""
+        if self._mmap is None:
+            raise RuntimeError("Array is not memory-mapped. This should not happen if len > 0.")
+
+        if array.np is not None:
+            np = array.np
+            with self._reading():
+                data = np.frombuffer(self._mmap, dtype=np.uint8, count=end - start, offset=self._data_offset + start)
+                bits = np.unpackbits(data, bitorder="little").astype(bool)
+                del data  # Release the mapping before _reading() ends
+            return bits
+
+        data = self._mmap[self._data_offset + start : self._data_offset + end]
+        return [bool(byte >> bit & 1) for byte in data for bit in range(8)]
+
+    def _set_bit(self, index, value):
+        """Set or clear the bit at index. The caller must hold the lock, as neighbouring bits share the byte."""
+        mapped = self._mmap
+        if mapped is None:
+            raise RuntimeError("Array is not memory-mapped. This should not happen if len > 0.")
+
+        offset = self._data_offset + (index >> 3)
+        mask = 1 << (index & 7)
+        if value:
+            mapped[offset] |= mask
+        else:
+            mapped[offset] &= ~mask & 0xFF
+
+    def __iter__(self):
+        # Like Array, snapshot the length and unpack a block of bytes at a time
+        length = self._len
+        block_bytes = self._nbytes(self.EXTEND_BATCH_ELEMENTS)
+        for start in range(0, self._nbytes(length), block_bytes):
+            end = min(start + block_bytes, self._nbytes(length))
+            bits = self._unpack_bits(start, end)[: length - start * 8]
+            yield from bits.tolist() if array.np is not None else bits
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._get_slice(index)
+
+        index = self._validate_index(index)
+
+        mapped = self._mmap
+        if mapped is None:
+            raise RuntimeError("Array is not memory-mapped. This should not happen if len > 0.")
+
+        return bool(mapped[self._data_offset + (index >> 3)] >> (index & 7) & 1)
+
+    def _get_slice(self, index):
+        """Read a slice in bulk, as a numpy bool array if numpy is available or a list if not."""
+        positions = range(*index.indices(self._len))
+        if not positions:
+            return [] if array.np is None else array.np.empty(0, dtype=bool)
+
+        # Unpack the bytes covering the slice, then pick out the steps
+        low = min(positions[0], positions[-1])
+        high = max(positions[0], positions[-1]) + 1
+        first_byte = low >> 3
+        bits = self._unpack_bits(first_byte, self._nbytes(high))
+        return bits[positions[0] - first_byte * 8 :: positions.step][: len(positions)]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            positions = range(*index.indices(self._len))
+            values = list(value)
+            if len(values) != len(positions):
+                raise ValueError(
+                    f"Cannot assign {len(values)} values to a slice of {len(positions)}, arrays don't support inserts"
+                )
+            with self._lock:
+                for position, bit in zip(positions, values):
+                    self._set_bit(position, bit)
+            return
+
+        index = self._validate_index(index)
+        with self._lock:
+            self._set_bit(index, value)
+
+    def append(self, value):
+        with self._lock:
+            if self._len == self._capacity:
+                self._resize(self._len + 1)
+
+            self._set_bit(self._len, value)
+            self._len += 1
+
+    def extend(self, iterable):
+        for batch in self._batches(iterable):
+            self._extend_bits([bool(value) for value in batch])
+
+    def _extend_bits(self, bits):
+        """Add a list of bools to the end of the array."""
+        with self._lock:
+            new_len = self._len + len(bits)
+            if new_len > self._capacity:
+                self._resize(new_len)
+
+            # Fill up a partly used last byte one bit at a time, then write whole bytes
+            head = min(-self._len % 8, len(bits))
+            for i in range(head):
+                self._set_bit(self._len + i, bits[i])
+
+            packed = self._pack_bits(bits[head:])
+            offset = self._data_offset + self._nbytes(self._len + head)
+            self._mmap[offset : offset + len(packed)] = packed
+
+            self._len = new_len
+
+    def __contains__(self, value):
+        if value not in (True, False):
+            return False
+
+        length = self._len
+        if not length:
+            return False
+
+        mapped = self._mmap
+        if mapped is None:
+            raise RuntimeError("Array is not memory-mapped. This should not happen if len > 0.")
+
+        # Any whole byte that isn't all the other value holds a match. Copying a block out is one
+        # step under the GIL, so unlike a view it can't hold up a resize.
+        other = 0 if value else 0xFF
+        full, partial = divmod(length, 8)
+        start, end = self._data_offset, self._data_offset + full
+        with self._sequential(start, full):
+            for offset in range(start, end, self.SCAN_BLOCK_BYTES):
+                block = mapped[offset : min(offset + self.SCAN_BLOCK_BYTES, end)]
+                if block.count(other) != len(block):
+                    return True
+
+        if not partial:
+            return False
+
+        # Then check the used bits of a partial last byte
+        mask = (1 << partial) - 1
+        last = mapped[end] & mask
+        return last != 0 if value else last != mask
+
+    def __imul__(self, value):
+        if isinstance(value, int) and value > 1 and self._len % 8:
+            # The copies wouldn't start on a byte boundary, so repeat the bits instead
+            bits = list(self)
+            for _ in range(value - 1):
+                self.extend(bits)
+            return self
+        return super().__imul__(value)
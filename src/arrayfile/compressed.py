@@ -0,0 +1,254 @@
+import os
+import struct
+import tempfile
+import threading
+import weakref
+
+from . import array
+from .array import Array
+
+try:
+    import blosc
+except ImportError:  # blosc is optional, only compressed arrays need it
+    blosc = None
+
+
+class CompressedArray(Array):
+    """An append-mostly Array stored as Blosc-compressed chunks.
+
+    Created with Array(dtype, ..., compressed=True). Values are buffered in memory
+    until a chunk's worth (CHUNK_BYTES uncompressed) has been added, then the chunk
+    is compressed and appended to the file. Reading an element decompresses its
+    chunk, and the last chunk read is cached. Values that have been compressed
+    can't be changed, only the unsealed tail can.
+
+    The file is the usual header (with its own magic) followed by the chunks, each
+    prefixed with its compressed size. Any unsealed tail is written as a short
+    final chunk on close, and read back into memory when the file is reopened.
+    """
+
+    MAGIC = b"ARYZ"
+    CHUNK_BYTES = 64 * 1024
+    _chunk_header = struct.Struct("<I")
+
+    def __init__(self, dtype, filename=None, mode="r+b", initial_elements=0, bulk_mode="mmap", *, compressed=True):
+        # initial_elements and bulk_mode are accepted so Array(..., compressed=True) works, but
+        # there is nothing to preallocate or map.
+        if blosc is None:
+            raise ImportError("blosc is required for compressed arrays")
+        self._check_bulk_mode(bulk_mode)
+
+        self._lock = threading.Lock()
+
+        if filename is None:
+            fd, filename = tempfile.mkstemp()
+            os.close(fd)
+            mode = "w+b"  # Always create new temp files
+
+        self._filename = filename
+        self._setup_dtype(dtype)
+        self._file = None
+        self._mmap = None
+        self._len = 0
+        self._chunk_elements = max(1, self.CHUNK_BYTES // self._element_size)
+        self._chunks = []  # (offset, size) of each compressed chunk in the file
+        self._tail = bytearray()  # packed values that haven't filled a chunk yet
+        self._cached_chunk = (None, b"")
+
+        if "w" in mode or not os.path.exists(filename):
+            self._file = open(filename, "w+b")
+            self._end = self.HEADER_SIZE
+            self._write_header()
+        else:
+            self._file = open(filename, mode)
+            if not self._read_header():
+                raise ValueError("File does not have a valid array header")
+            self._load_chunks()
+
+        # Set up finalizer to ensure cleanup even if close() isn't called
+        self._finalizer = weakref.finalize(self, self.close)
+
+    def _load_chunks(self):
+        """Index the chunks in the file, and load a short final chunk back into the tail."""
+        file_size = os.fstat(self._file.fileno()).st_size
+        offset = self.HEADER_SIZE
+        while offset < file_size:
+            self._file.seek(offset)
+            (size,) = self._chunk_header.unpack(self._file.read(self._chunk_header.size))
+            self._chunks.append((offset + self._chunk_header.size, size))
+            offset += self._chunk_header.size + size
+
+        if offset != file_size:
+            raise ValueError("Compressed chunks run past the end of the file")
+        self._end = offset
+
+        if self._len < len(self._chunks) * self._chunk_elements:
+            # The short chunk stays in the file, so it's still whole if close() is never called. The
+            # next chunk sealed overwrites it, and close() truncates anything left past the end.
+            self._tail = bytearray(self._chunk_data(len(self._chunks) - 1))
+            offset, _ = self._chunks.pop()
+            self._end = offset - self._chunk_header.size
+            self._cached_chunk = (None, b"")
+
+        if len(self._chunks) * self._chunk_elements + len(self._tail) // self._element_size != self._len:
+            raise ValueError(f"Compressed chunks don't add up to the header length of {self._len}")
+
+    def _chunk_data(self, chunk):
+        """Return the decompressed bytes of a sealed chunk, caching the last one."""
+        cached_chunk, data = self._cached_chunk
+        if cached_chunk != chunk:
+            if not self._file:
+                raise RuntimeError("Array is closed")
+            offset, size = self._chunks[chunk]
+            self._file.seek(offset)
+            data = blosc.decompress(self._file.read(size))
+            self._cached_chunk = (chunk, data)
+        return data
+
+    def _seal(self, data):
+        """Compress a chunk's worth of packed values and append it to the file."""
+        compressed = blosc.compress(bytes(data), typesize=self._element_size)
+        self._file.seek(self._end)
+        self._file.write(self._chunk_header.pack(len(compressed)))
+        self._file.write(compressed)
+        self._chunks.append((self._end + self._chunk_header.size, len(compressed)))
+        self._end += self._chunk_header.size + len(compressed)
+
+    def _blocks(self):
+        """Yield the packed bytes of every chunk and then the tail, as they were when called."""
+        with self._lock:
+            chunks = len(self._chunks)
+            tail = bytes(self._tail)
+
+        for chunk in range(chunks):
+            with self._lock:
+                data = self._chunk_data(chunk)
+            yield data
+        yield tail
+
+    def __iter__(self):
+        for data in self._blocks():
+            for (value,) in self._struct.iter_unpack(data):
+                yield value
+
+    def __contains__(self, value):
+        return any(item == value for item in self)
+
+    def asarray(self):
+        raise TypeError("Compressed arrays can't be viewed without copying, use a slice instead")
+
+    def memoryview(self):
+        raise TypeError("Compressed arrays can't be viewed without copying, use a slice instead")
+
+    def _locate(self, index):
+        """Return the packed bytes holding an element and its byte offset within them."""
+        chunk, position = divmod(index, self._chunk_elements)
+        data = self._tail if chunk == len(self._chunks) else self._chunk_data(chunk)
+        return data, position * self._element_size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._get_slice(index)
+
+        index = self._validate_index(index)
+        with self._lock:
+            data, offset = self._locate(index)
+            return self._unpack_from(data, offset)[0]
+
+    def _get_slice(self, index):
+        """Read a slice, as a numpy array if numpy is available or a list if not."""
+        positions = range(*index.indices(self._len))
+        with self._lock:
+            values = [self._unpack_from(*self._locate(position))[0] for position in positions]
+
+        if self._np_dtype is not None:
+            return array.np.array(values, dtype=self._np_dtype)
+        return values
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            positions = range(*index.indices(self._len))
+            values = list(value)
+            if len(values) != len(positions):
+                raise ValueError(
+                    f"Cannot assign {len(values)} values to a slice of {len(positions)}, arrays don't support inserts"
+                )
+            for position, item in zip(positions, values):
+                self[position] = item
+            return
+
+        index = self._validate_index(index)
+        packed_value = self._pack_value(value)
+
+        with self._lock:
+            position = index - len(self._chunks) * self._chunk_elements
+            if position < 0:
+                raise TypeError("Compressed values can't be changed, only ones added since the last full chunk")
+
+            offset = position * self._element_size
+            self._tail[offset : offset + self._element_size] = packed_value
+
+    def append(self, value):
+        self._add(self._pack_value(value))
+
+    def extend(self, iterable):
+        if self._np_dtype is not None and isinstance(iterable, array.np.ndarray):
+            self._add(self._pack_array(iterable))
+            return
+
+        for batch in self._batches(iterable):
+            self._add(self._pack_values(batch))
+
+    def _add(self, packed_values):
+        """Add packed values to the tail, compressing every chunk that fills up."""
+        with self._lock:
+            self._tail += packed_values
+            self._len += len(packed_values) // self._element_size
+            chunk_bytes = self._chunk_elements * self._element_size
+
+            # Seal from a view so full chunks aren't copied, and drop each one from the tail as soon
+            # as it's in the file, so a failed write (a full disk) can't leave it in both
+            while len(self._tail) >= chunk_bytes:
+                with memoryview(self._tail) as tail:
+                    self._seal(tail[:chunk_bytes])
+                del self._tail[:chunk_bytes]
+
+    def __imul__(self, value):
+        if not isinstance(value, int) or value < 0:
+            return NotImplemented
+
+        if value == 0:
+            with self._lock:
+                self._file.truncate(self.HEADER_SIZE)
+                self._end = self.HEADER_SIZE
+                self._chunks = []
+                self._tail = bytearray()
+                self._cached_chunk = (None, b"")
+                self._len = 0
+        elif value > 1:
+            packed_values = b"".join(self._blocks())
+            for _ in range(value - 1):
+                self._add(packed_values)
+        return self
+
+    def flush(self):
+        if self._file:
+            self._file.flush()
+
+    def close(self, sync=False):
+        """Compress the tail, write the header and close the file. With sync=True, fsync it too."""
+        if not self._file:
+            return
+
+        if self._tail:
+            self._seal(self._tail)
+            self._tail = bytearray()
+
+        # Drop whatever is past the last chunk, like a longer short chunk that was sealed over
+        self._file.truncate(self._end)
+        self._write_header()
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
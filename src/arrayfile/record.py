@@ -0,0 +1,117 @@
+from .array import Array
+
+
+class RecordArray:
+    """An array of fixed-size records, stored as a struct of arrays.
+
+    The dtype is a comma-separated list of field dtypes, like "f,f" for x, y pairs.
+    Each field lives in its own Array file (filename.0, filename.1, ...), so every
+    column is a flat run of one type that can be viewed with field() and scanned
+    without striding over the others.
+    """
+
+    def __init__(self, dtype, filename=None, mode="r+b", initial_elements=0, names=None, bulk_mode="mmap"):
+        dtypes = dtype.split(",")
+        if names is None:
+            names = [f"f{i}" for i in range(len(dtypes))]
+        names = tuple(names)
+
+        if len(names) != len(dtypes):
+            raise ValueError(f"Got {len(names)} names for {len(dtypes)} fields")
+        if len(set(names)) != len(names):
+            raise ValueError("Field names must be unique")
+
+        self._dtype = dtype
+        self._names = names
+        self._fields = []
+        try:
+            for i, field_dtype in enumerate(dtypes):
+                field_filename = None if filename is None else f"{filename}.{i}"
+                self._fields.append(Array(field_dtype, field_filename, mode, initial_elements, bulk_mode))
+        except Exception:
+            self.close()
+            raise
+
+        if len({len(field) for field in self._fields}) > 1:
+            self.close()
+            raise ValueError("Field files have different lengths")
+
+    @property
+    def names(self):
+        return self._names
+
+    def __len__(self):
+        return len(self._fields[0])
+
+    def field(self, name):
+        """Return a numpy array over one field's data, sharing memory with its file."""
+        if name not in self._names:
+            raise KeyError(name)
+        return self._fields[self._names.index(name)].asarray()
+
+    def __iter__(self):
+        return zip(*self._fields)
+
+    def __getitem__(self, index):
+        """Return a record as a tuple. For a slice, return a tuple of field slices."""
+        return tuple(field[index] for field in self._fields)
+
+    def __setitem__(self, index, record):
+        """Set a record from a sequence of field values. For a slice, give a sequence of field slices."""
+        record = self._check_record(record)
+        for field, value in zip(self._fields, record):
+            field[index] = value
+
+    def __contains__(self, record):
+        try:
+            record = self._check_record(record)
+        except (TypeError, ValueError):
+            return False
+        return any(existing == record for existing in self)
+
+    def _check_record(self, record):
+        """Return the record as a tuple, making sure it has a value for every field."""
+        record = tuple(record)
+        if len(record) != len(self._fields):
+            raise ValueError(f"Record has {len(record)} values, expected {len(self._fields)}")
+        return record
+
+    def append(self, record):
+        self.extend([record])
+
+    def extend(self, records):
+        records = [self._check_record(record) for record in records]
+        if not records:
+            return
+
+        # Write column by column. If a field rejects its values, roll back every field (including
+        # any batches the failing one already took) so they all stay the same length.
+        start = len(self)
+        try:
+            for field, column in zip(self._fields, zip(*records)):
+                field.extend(column)
+        except Exception:
+            for field in self._fields:
+                with field._lock:
+                    field._len = start
+            raise
+
+    def __iadd__(self, other):
+        if hasattr(other, "__iter__"):
+            self.extend(other)
+            return self
+        return NotImplemented
+
+    def flush(self):
+        for field in self._fields:
+            field.flush()
+
+    def close(self, sync=False):
+        for field in self._fields:
+            field.close(sync)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,36 @@
+import glob
+import os
+import tempfile
+
+import pytest
+
+
+@pytest.fixture
+def temp_filepath():
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    yield path
+    os.remove(path)
+    # RecordArray keeps each field in its own file next to it
+    for field_path in glob.glob(f"{glob.escape(path)}.*"):
+        os.remove(field_path)
+
+
+@pytest.fixture
+def no_numpy(monkeypatch):
+    """Make arrays created inside the test behave as if numpy isn't installed."""
+    import arrayfile.array
+
+    monkeypatch.setattr(arrayfile.array, "np", None)
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "no-numpy"])
+def numpy_enabled(request, monkeypatch):
+    """Run the test with and without numpy, skipping the numpy run if it isn't installed."""
+    import arrayfile.array
+
+    if not request.param:
+        monkeypatch.setattr(arrayfile.array, "np", None)
+    elif arrayfile.array.np is None:
+        pytest.skip("numpy is not installed")
+    return request.param
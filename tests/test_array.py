@@ -1,19 +1,10 @@
 import pytest
 import os
-import tempfile
 import struct
 
 from arrayfile import Array
 
 
-@pytest.fixture
-def temp_filepath():
-    fd, path = tempfile.mkstemp()
-    os.close(fd)
-    yield path
-    os.remove(path)
-
-
 def test_init_new_file_no_filename():
     # Test case for filename=None, allowing Array to create its own temp file
     array = None
@@ -335,6 +326,19 @@ def test_extend(temp_filepath):
     array.close()
 
 
+@pytest.mark.parametrize(
+    "dtype, values", [("s", [b"a", b"b", b"c"]), ("p", [b"", b"", b""]), ("2p", [b"x", b"", b"z"])]
+)
+def test_extend_strings(temp_filepath, dtype, values):
+    """Test that a count on a string code is its length, so bulk packing mustn't use one as a repeat."""
+    array = Array(dtype, temp_filepath, "w+b")
+    array.extend(values)
+    array.extend(values)
+    assert len(array) == 6
+    assert list(array) == values * 2
+    array.close()
+
+
 def test_iadd(temp_filepath):
     array = Array("i", temp_filepath, "w+b")
     array.append(1)
@@ -576,3 +580,598 @@ def test_imul_triggers_resize(temp_filepath):
         assert array[i + 1000] == i
         assert array[i + 2000] == i
     array.close()
+
+
+def test_extend_type_error(temp_filepath):
+    """Test that a bad value in extend leaves the array untouched."""
+    array = Array("i", temp_filepath, "w+b")
+    array.extend([1, 2])
+    with pytest.raises(TypeError, match="cannot be packed"):
+        array.extend([3, "not an int", 5])
+    assert list(array) == [1, 2]
+    array.close()
+
+
+@pytest.mark.parametrize("dtype", ["<i", ">h", "=d", "l"])
+def test_extend_explicit_byte_order(temp_filepath, dtype):
+    """Test that bulk packing matches per-element packing for prefixed dtypes."""
+    array = Array(dtype, temp_filepath, "w+b")
+    array.extend([1, 2, 3])
+    array.append(4)
+    assert list(array) == [1, 2, 3, 4]
+    array.close()
+
+
+@pytest.mark.parametrize("dtype", ["b", "H", "i", "l", "Q", "f", "d", "<i", ">d"])
+def test_extend_numpy_array(temp_filepath, dtype):
+    """Test that extending with a numpy array matches extending with a list."""
+    np = pytest.importorskip("numpy")
+    array = Array(dtype, temp_filepath, "w+b")
+    array.extend(np.arange(10))
+    array.extend([10, 11])
+    assert list(array) == list(range(12))
+    array.close()
+
+
+def test_extend_numpy_array_type_error(temp_filepath):
+    """Test that numpy arrays of the wrong kind are rejected, not truncated."""
+    np = pytest.importorskip("numpy")
+    array = Array("i", temp_filepath, "w+b")
+    with pytest.raises(TypeError, match="cannot be packed"):
+        array.extend(np.array([1.5, 2.5]))
+    with pytest.raises(TypeError, match="Only 1-d arrays"):
+        array.extend(np.zeros((2, 2), dtype="i4"))
+    assert len(array) == 0
+    array.close()
+
+
+def test_extend_numpy_array_out_of_range(temp_filepath):
+    """Test that numpy integers that don't fit the dtype are rejected, not wrapped."""
+    np = pytest.importorskip("numpy")
+    array = Array("B", temp_filepath, "w+b")
+    with pytest.raises(TypeError, match="out of range"):
+        array.extend(np.array([1, 256]))
+    with pytest.raises(TypeError, match="out of range"):
+        array.extend(np.array([-1]))
+    assert len(array) == 0
+    array.close()
+
+
+def test_iteration_and_contains_without_numpy(temp_filepath, no_numpy):
+    array = Array("i", temp_filepath, "w+b")
+    array.extend([10, 20, 30])
+    assert list(array) == [10, 20, 30]
+    assert 20 in array
+    assert 40 not in array
+    with pytest.raises(ImportError, match="numpy is required"):
+        array.asarray()
+    array.close()
+
+
+def test_contains_exact_float32(temp_filepath):
+    """Test that contains compares stored values exactly, not at the storage precision."""
+    array = Array("f", temp_filepath, "w+b")
+    array.extend([0.5, 3.14])
+    assert 0.5 in array
+    assert 3.14 not in array
+    assert array[1] in array
+    assert float("nan") not in array
+    array.close()
+
+
+def test_contains_unrepresentable_values(temp_filepath):
+    array = Array("b", temp_filepath, "w+b")
+    array.extend([1, 2, 3])
+    assert 2.0 in array
+    assert 2.5 not in array
+    assert 1000 not in array
+    assert float("inf") not in array
+    assert "1" not in array
+    assert [1, 2] not in array
+    array.close()
+
+
+def test_asarray_shares_memory(temp_filepath):
+    pytest.importorskip("numpy")
+    array = Array("d", temp_filepath, "w+b")
+    array.extend([1.0, 2.0, 3.0])
+    view = array.asarray()
+    assert view.tolist() == [1.0, 2.0, 3.0]
+    view[1] = 5.0
+    assert array[1] == 5.0
+    del view
+    array.close()
+
+
+def test_asarray_empty(temp_filepath):
+    pytest.importorskip("numpy")
+    array = Array("i", temp_filepath, "w+b")
+    assert array.asarray().tolist() == []
+    array.extend([1])
+    array *= 0
+    assert array.asarray().tolist() == []
+    array.close()
+
+
+def test_memoryview(temp_filepath):
+    array = Array("i", temp_filepath, "w+b")
+    array.extend([1, 2, 3])
+    with array.memoryview() as view:
+        assert view.format == "i"
+        assert view.tolist() == [1, 2, 3]
+        view[0] = 7
+    assert array[0] == 7
+    array.close()
+
+
+def test_memoryview_non_native_dtype(temp_filepath):
+    array = Array("<h", temp_filepath, "w+b")
+    array.extend([1, 2])
+    with array.memoryview() as view:
+        assert view.format == "B"
+        assert view.tobytes() == struct.pack("<hh", 1, 2)
+    array.close()
+
+
+@pytest.mark.parametrize("factor", [2, 5, 8, 13])
+def test_imul_repeats(temp_filepath, factor):
+    """Test that tiling is correct whether or not the factor is a power of two."""
+    array = Array("h", temp_filepath, "w+b")
+    array.extend([1, 2, 3])
+    array *= factor
+    assert list(array) == [1, 2, 3] * factor
+    array.close()
+
+
+def test_imul_empty(temp_filepath):
+    array = Array("i", temp_filepath, "w+b")
+    array *= 5
+    assert len(array) == 0
+    array.close()
+
+
+def test_resize_grows_geometrically(temp_filepath, monkeypatch):
+    monkeypatch.setattr(Array, "RESERVE_BYTES", 0)
+    array = Array("i", temp_filepath, "w+b")
+    capacity = array._capacity
+    array.extend(range(capacity + 1))
+    assert array._capacity >= capacity * 2
+
+    # A large jump still gets at least what it asked for
+    array.extend(range(array._capacity * 3))
+    assert array._capacity >= len(array)
+    array.close()
+
+
+def test_resize_keeps_data_when_remapping(temp_filepath, monkeypatch):
+    """Test the fallback for platforms that can't resize a mapping in place."""
+    import mmap
+
+    class NoResizeMmap(mmap.mmap):
+        def resize(self, newsize):
+            raise SystemError("mmap: resizing not available--no mremap()")
+
+    monkeypatch.setattr(mmap, "mmap", NoResizeMmap)
+    monkeypatch.setattr(Array, "RESERVE_BYTES", 0)
+    array = Array("i", temp_filepath, "w+b")
+    array.extend(range(100))
+    assert isinstance(array._mmap, NoResizeMmap)
+    array.extend(range(100, 5000))
+    assert list(array) == list(range(5000))
+    array.close()
+
+
+def test_reservation_is_truncated_on_close(temp_filepath, monkeypatch):
+    monkeypatch.setattr(Array, "RESERVE_BYTES", 1 << 20)
+    array = Array("i", temp_filepath, "w+b")
+    assert os.path.getsize(temp_filepath) == 1 << 20
+    array.extend(range(1000))
+    array.close()
+    assert os.path.getsize(temp_filepath) == Array.HEADER_SIZE + 4000
+
+    # Reopening reserves again, so appending doesn't need to remap
+    with Array("i", temp_filepath, "r+b") as array:
+        assert array._capacity_bytes == (1 << 20) - Array.HEADER_SIZE
+        array.append(1000)
+        assert list(array) == list(range(1001))
+    assert os.path.getsize(temp_filepath) == Array.HEADER_SIZE + 4004
+
+
+def test_header_written_through_mmap(temp_filepath):
+    """Test that the header is visible in the file while the array is still open."""
+    array = Array("i", temp_filepath, "w+b")
+    array.extend([1, 2, 3])
+    array._write_header()
+    array.flush()
+    with open(temp_filepath, "rb") as f:
+        header = Array._header_struct.unpack(f.read(Array.HEADER_SIZE))
+    assert header[0] == Array.MAGIC
+    assert header[-1] == 3
+    array.close()
+
+
+def test_close_after_imul_zero_writes_header(temp_filepath):
+    array = Array("i", temp_filepath, "w+b")
+    array.extend([1, 2, 3])
+    array *= 0
+    array.close()
+
+    with Array("i", temp_filepath, "r+b") as array:
+        assert len(array) == 0
+        array.append(4)
+    with Array("i", temp_filepath, "r+b") as array:
+        assert list(array) == [4]
+
+
+@pytest.mark.parametrize("dtype, values", [("i", [1, -2, 3]), ("<d", [0.5, 1.5]), ("2s", [b"ab", b"cd"])])
+def test_iteration_without_numpy(temp_filepath, no_numpy, dtype, values):
+    array = Array(dtype, temp_filepath, "w+b")
+    array.extend(values)
+    assert list(array) == values
+    array.close()
+
+
+def test_iteration_allows_appending(temp_filepath, no_numpy):
+    array = Array("i", temp_filepath, "w+b")
+    array.extend([1, 2, 3])
+    for value in array:
+        array.append(value * 10)
+    assert list(array) == [1, 2, 3, 10, 20, 30]
+    array.close()
+
+
+def test_iteration_in_blocks(temp_filepath, numpy_enabled, monkeypatch):
+    monkeypatch.setattr(Array, "EXTEND_BATCH_ELEMENTS", 7)
+    array = Array("i", temp_filepath, "w+b")
+    array.extend(range(50))
+    values = iter(array)
+    assert next(values) == 0
+
+    # The length is snapshotted when iteration starts
+    array.extend(range(50, 60))
+    assert list(values) == list(range(1, 50))
+    array.close()
+
+
+def test_contains_without_numpy_releases_view(temp_filepath, no_numpy):
+    """Test that an early match doesn't leave the mapping pinned."""
+    array = Array("i", temp_filepath, "w+b")
+    array.extend([1, 2, 3])
+    assert 1 in array
+    assert 4 not in array
+    array.close()
+
+
+def test_bulk_operations_with_access_hints(temp_filepath, monkeypatch, numpy_enabled):
+    """Test bulk operations with madvise hints on every call, however small."""
+    monkeypatch.setattr(Array, "ADVISE_MIN_BYTES", 0)
+
+    array = Array("i", temp_filepath, "w+b")
+    array.extend(range(5000))
+    array *= 3
+    assert list(array) == list(range(5000)) * 3
+    assert 4999 in array
+    assert 5000 not in array
+
+    assert list(array[100:5100]) == list(range(100, 5000)) + list(range(100))
+    assert list(array[-1:-4000:-2]) == list(range(4999, 999, -2))
+    array[:5000] = range(5000, 10000)
+    array[5000::2] = [0] * 5000
+    assert array[4999] == 9999
+    assert array[5000] == 0
+    assert array[5001] == 1
+    array.close()
+
+
+def test_index_accepts_index_types(temp_filepath):
+    """Test that anything with __index__ works as an index, not just int."""
+
+    class Index:
+        def __index__(self):
+            return 1
+
+    array = Array("i", temp_filepath, "w+b")
+    array.extend([10, 20, 30])
+    assert array[Index()] == 20
+    array[Index()] = 25
+    assert array[1] == 25
+    assert array[True] == 25
+    with pytest.raises(TypeError, match="Index must be an integer"):
+        _ = array["1"]
+    array.close()
+
+
+SLICES = [
+    slice(None),
+    slice(2, 7),
+    slice(-3, None),
+    slice(1, 9, 3),
+    slice(None, None, -1),
+    slice(8, 1, -2),
+    slice(5, 5),
+    slice(20, 30),
+]
+
+
+@pytest.mark.parametrize("index", SLICES)
+def test_getitem_slice(temp_filepath, numpy_enabled, index):
+    values = list(range(10))
+    array = Array("i", temp_filepath, "w+b")
+    array.extend(values)
+    result = array[index]
+    if numpy_enabled:
+        assert result.dtype.itemsize == 4
+        result = result.tolist()
+    else:
+        assert isinstance(result, list)
+    assert result == values[index]
+    array.close()
+
+
+@pytest.mark.parametrize("index", SLICES)
+def test_setitem_slice(temp_filepath, numpy_enabled, index):
+    values = list(range(10))
+    array = Array("i", temp_filepath, "w+b")
+    array.extend(values)
+    replacement = [100 + i for i in range(len(values[index]))]
+    array[index] = replacement
+    values[index] = replacement
+    assert list(array) == values
+    array.close()
+
+
+@pytest.mark.parametrize("dtype", ["s", "p"])
+@pytest.mark.parametrize("index", SLICES)
+def test_string_slices(temp_filepath, dtype, index):
+    values = [b"a", b"b", b"c", b"d", b"e", b"f", b"g", b"h", b"i", b"j"]
+    if dtype == "p":
+        values = [b""] * 10  # A 1 byte pascal string only has room for its length
+    array = Array(dtype, temp_filepath, "w+b")
+    for value in values:
+        array.append(value)
+    assert list(array[index]) == values[index]
+
+    replacement = values[::-1][index]
+    array[index] = replacement
+    values[index] = replacement
+    assert list(array) == values
+    array.close()
+
+
+def test_setitem_slice_numpy_array(temp_filepath):
+    np = pytest.importorskip("numpy")
+    array = Array("d", temp_filepath, "w+b")
+    array.extend([0.0] * 5)
+    array[1:4] = np.array([1, 2, 3])
+    assert list(array) == [0.0, 1.0, 2.0, 3.0, 0.0]
+    array.close()
+
+
+def test_setitem_slice_wrong_length(temp_filepath):
+    array = Array("i", temp_filepath, "w+b")
+    array.extend([1, 2, 3])
+    with pytest.raises(ValueError, match="don't support inserts"):
+        array[0:2] = [1, 2, 3]
+    with pytest.raises(ValueError, match="don't support inserts"):
+        array[::2] = [1]
+    assert list(array) == [1, 2, 3]
+    array.close()
+
+
+def test_slice_of_composite_dtype(temp_filepath):
+    array = Array("2s", temp_filepath, "w+b")
+    array.extend([b"ab", b"cd", b"ef"])
+    assert list(array[1:]) == [b"cd", b"ef"]
+    array[:2] = [b"xy", b"zz"]
+    assert list(array) == [b"xy", b"zz", b"ef"]
+    array.close()
+
+
+def test_grow_while_view_is_alive(temp_filepath, monkeypatch):
+    """Test that a live view stops the mapping moving, rather than being left on an old one."""
+    monkeypatch.setattr(Array, "RESERVE_BYTES", 0)
+    array = Array("i", temp_filepath, "w+b")
+    array.extend([1, 2, 3])
+
+    with array.memoryview() as view:
+        # Growing within the mapped capacity is fine
+        array.append(4)
+        with pytest.raises(BufferError):
+            array.extend(range(10000))
+        assert len(array) == 4
+
+        view[0] = 7
+        assert array[0] == 7
+
+    array.extend(range(10000))
+    assert len(array) == 10004
+    assert array[-1] == 9999
+    array.close()
+
+
+@pytest.mark.parametrize("read", ["slice", "contains"])
+def test_bulk_reads_dont_block_growth(temp_filepath, monkeypatch, numpy_enabled, read):
+    """Test that a writer growing the array waits for concurrent bulk reads, rather than failing."""
+    import threading
+
+    monkeypatch.setattr(Array, "RESERVE_BYTES", 0)
+    array = Array("i", temp_filepath, "w+b")
+    array.append(0)
+    done = threading.Event()
+    errors = []
+
+    def reader():
+        try:
+            while not done.is_set():
+                if read == "slice":
+                    array[0 : len(array)]
+                else:
+                    assert -5 not in array
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for _ in range(200):
+            array.extend(range(1000))
+    finally:
+        done.set()
+        thread.join()
+
+    assert errors == []
+    assert len(array) == 200_001
+    array.close()
+
+
+def test_stale_view_survives_failed_growth(temp_filepath, monkeypatch):
+    """Test that a view stays on the live mapping, so a later truncate can't pull the file out from under it."""
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(Array, "RESERVE_BYTES", 0)
+    array = Array("i", temp_filepath, "w+b")
+    array.extend([1, 2, 3])
+
+    view = array.asarray()
+    with pytest.raises(BufferError):
+        array.extend(range(10000))
+    with pytest.raises(BufferError):
+        array *= 0
+    assert len(array) == 3
+    assert view.sum() == 6
+    assert np.array_equal(view, [1, 2, 3])
+
+    del view
+    array *= 0
+    assert len(array) == 0
+    array.close()
+
+
+@pytest.mark.parametrize("dtype", ["b", "H", "i", "q", "f", "d", ">i", "e"])
+def test_contains_with_kernels(temp_filepath, monkeypatch, dtype):
+    """Test contains on every kind of dtype, whether or not the numba kernel can handle it."""
+    pytest.importorskip("numba")
+    monkeypatch.setattr(Array, "KERNEL_MIN_ELEMENTS", 0)
+    array = Array(dtype, temp_filepath, "w+b")
+    assert 1 not in array
+    array.extend([1, 2, 3])
+    assert array._use_kernels == (dtype not in (">i", "e"))
+    assert 3 in array
+    assert 4 not in array
+    array.close()
+
+
+def test_small_arrays_skip_kernels(temp_filepath, monkeypatch):
+    """Test that numba isn't loaded for arrays too small to make up for it."""
+    from arrayfile import _kernels
+
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(_kernels, "available", True)
+    monkeypatch.setattr(_kernels, "_compiled", lambda: pytest.fail("kernels were loaded"))
+    monkeypatch.setattr(Array, "KERNEL_MIN_ELEMENTS", 4)
+    array = Array("i", temp_filepath, "w+b")
+    array.extend([1, 2, 3])
+    assert array._use_kernels
+    assert 3 in array
+    array.append(4)
+    with pytest.raises(pytest.fail.Exception, match="kernels were loaded"):
+        _ = 4 in array
+    array.close()
+
+
+def test_extend_preallocates_blocks(temp_filepath):
+    if not hasattr(os, "posix_fallocate") or not hasattr(os.stat_result, "st_blocks"):
+        pytest.skip("posix_fallocate is not available")
+
+    array = Array("q", temp_filepath, "w+b")
+    array.extend(range(100_000))
+    # 800KB of data should be backed by real blocks, not holes
+    assert os.stat(temp_filepath).st_blocks * 512 >= 800_000
+    assert array[-1] == 99_999
+    array.close()
+
+
+def test_extend_ignores_unsupported_preallocation(temp_filepath, monkeypatch):
+    import errno
+
+    def unsupported(fd, offset, length):
+        raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+    monkeypatch.setattr(os, "posix_fallocate", unsupported, raising=False)
+    array = Array("q", temp_filepath, "w+b")
+    array.extend(range(10_000))
+    assert list(array) == list(range(10_000))
+    array.close()
+
+
+def test_extend_raises_when_disk_is_full(temp_filepath, monkeypatch):
+    import errno
+
+    def full(fd, offset, length):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(os, "posix_fallocate", full, raising=False)
+    array = Array("q", temp_filepath, "w+b")
+    with pytest.raises(OSError, match="No space left"):
+        array.extend(range(10_000))
+    assert len(array) == 0
+    array.close()
+
+
+def test_close_sync(temp_filepath, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+
+    array = Array("i", temp_filepath, "w+b")
+    array.extend([1, 2, 3])
+    array.close()
+    assert synced == []
+
+    array = Array("i", temp_filepath, "r+b")
+    array.close(sync=True)
+    assert len(synced) == 1
+
+    with Array("i", temp_filepath, "r+b") as array:
+        assert list(array) == [1, 2, 3]
+
+
+def test_extend_bulk_mode_pwrite(temp_filepath):
+    if not hasattr(os, "pwrite"):
+        pytest.skip("pwrite is not available")
+
+    array = Array("i", temp_filepath, "w+b", bulk_mode="pwrite")
+    array.extend(range(5000))
+    array.append(5000)
+    array.extend([5001, 5002])
+    assert array[4999] == 4999
+    assert list(array) == list(range(5003))
+    array.close()
+
+    with Array("i", temp_filepath, "r+b") as array:
+        assert list(array) == list(range(5003))
+
+
+def test_invalid_bulk_mode(temp_filepath):
+    with pytest.raises(ValueError, match="Unknown bulk_mode 'io_uring'"):
+        Array("i", temp_filepath, "w+b", bulk_mode="io_uring")
+
+
+def test_extend_from_generator_in_batches(temp_filepath, monkeypatch):
+    monkeypatch.setattr(Array, "EXTEND_BATCH_ELEMENTS", 100)
+    array = Array("i", temp_filepath, "w+b")
+    array.extend(i for i in range(1050))
+    assert list(array) == list(range(1050))
+
+    # Extending with itself iterates a snapshot, so it doubles rather than running forever
+    array.extend(array)
+    assert len(array) == 2100
+    array.close()
+
+
+def test_extend_keeps_batches_before_a_bad_value(temp_filepath, monkeypatch):
+    """Like list.extend, values taken before the failure stay added."""
+    monkeypatch.setattr(Array, "EXTEND_BATCH_ELEMENTS", 10)
+    array = Array("i", temp_filepath, "w+b")
+    with pytest.raises(TypeError, match="cannot be packed"):
+        array.extend([*range(25), "not an int"])
+    assert list(array) == list(range(20))
+    array.close()
@@ -0,0 +1,184 @@
+import os
+
+import pytest
+
+from arrayfile import Array, BitArray
+
+
+def pattern(n):
+    return [i % 3 == 0 or i % 7 == 0 for i in range(n)]
+
+
+def test_bit_dtype_gives_bit_array(temp_filepath):
+    with Array("bit", temp_filepath, "w+b") as bits:
+        assert isinstance(bits, BitArray)
+        assert len(bits) == 0
+    with pytest.raises(ValueError, match="must be 'bit'"):
+        BitArray("B")
+
+
+def test_constructor_defaults(temp_filepath):
+    with Array("bit", temp_filepath, "w+b", compressed=False) as bits:
+        assert isinstance(bits, BitArray)
+    with pytest.raises(ValueError, match="can't be compressed"):
+        Array("bit", temp_filepath, "w+b", compressed=True)
+
+    bits = BitArray()
+    bits.extend([True, False])
+    assert list(bits) == [True, False]
+    bits.close()
+    os.unlink(bits._filename)
+
+
+def test_append_and_getitem(temp_filepath):
+    with Array("bit", temp_filepath, "w+b") as bits:
+        for value in pattern(20):
+            bits.append(value)
+        assert len(bits) == 20
+        assert [bits[i] for i in range(20)] == pattern(20)
+        assert bits[-1] is False
+        assert bits[0] is True
+        with pytest.raises(IndexError):
+            _ = bits[20]
+
+
+def test_packs_eight_per_byte(temp_filepath):
+    with Array("bit", temp_filepath, "w+b") as bits:
+        bits.extend(pattern(1001))
+    assert os.path.getsize(temp_filepath) == Array.HEADER_SIZE + 126
+
+    with Array("bit", temp_filepath, "r+b") as bits:
+        assert list(bits) == pattern(1001)
+
+
+@pytest.mark.parametrize("split", [0, 1, 5, 8, 13])
+def test_extend_unaligned(temp_filepath, numpy_enabled, split):
+    values = pattern(50)
+    with Array("bit", temp_filepath, "w+b") as bits:
+        bits.extend(values[:split])
+        bits.extend(values[split:])
+        assert list(bits) == values
+
+
+def test_extend_overwrites_stale_bits(temp_filepath):
+    with Array("bit", temp_filepath, "w+b") as bits:
+        bits.extend([True] * 16)
+        bits._len = 3
+        bits.extend([False] * 5)
+        bits.append(False)
+        assert list(bits) == [True] * 3 + [False] * 6
+
+
+def test_setitem(temp_filepath):
+    with Array("bit", temp_filepath, "w+b") as bits:
+        bits.extend([False] * 10)
+        bits[3] = True
+        bits[-1] = 1
+        assert list(bits) == [False] * 3 + [True] + [False] * 5 + [True]
+        bits[3] = False
+        assert bits[3] is False
+
+
+@pytest.mark.parametrize("index", [slice(None), slice(3, 17), slice(1, 20, 3), slice(None, None, -2), slice(9, 9)])
+def test_slices(temp_filepath, numpy_enabled, index):
+    values = pattern(21)
+    with Array("bit", temp_filepath, "w+b") as bits:
+        bits.extend(values)
+        assert list(bits[index]) == values[index]
+
+        replacement = [not value for value in values[index]]
+        bits[index] = replacement
+        values[index] = replacement
+        assert list(bits) == values
+
+
+def test_contains(temp_filepath):
+    with Array("bit", temp_filepath, "w+b") as bits:
+        assert True not in bits
+        bits.extend([False] * 8)
+        assert False in bits
+        assert True not in bits
+        bits.append(True)
+        assert True in bits
+        assert 2 not in bits
+        assert "x" not in bits
+
+        bits[:] = [True] * 9
+        assert False not in bits
+        bits.append(False)
+        assert False in bits
+
+
+@pytest.mark.parametrize("length", [8, 5])
+def test_imul(temp_filepath, length):
+    values = pattern(length)
+    with Array("bit", temp_filepath, "w+b") as bits:
+        bits.extend(values)
+        bits *= 3
+        assert list(bits) == values * 3
+        bits *= 0
+        assert len(bits) == 0
+
+
+def test_iteration_in_blocks(temp_filepath, numpy_enabled, monkeypatch):
+    monkeypatch.setattr(Array, "EXTEND_BATCH_ELEMENTS", 16)
+    with Array("bit", temp_filepath, "w+b") as bits:
+        bits.extend(pattern(101))
+        assert list(bits) == pattern(101)
+
+
+@pytest.mark.parametrize("batch", [3, 8, 16])
+def test_extend_in_batches(temp_filepath, numpy_enabled, monkeypatch, batch):
+    monkeypatch.setattr(Array, "EXTEND_BATCH_ELEMENTS", batch)
+    with Array("bit", temp_filepath, "w+b") as bits:
+        bits.append(True)
+        bits.extend(value for value in pattern(50))
+        assert list(bits) == [True] + pattern(50)
+
+
+def test_bulk_reads_dont_block_growth(temp_filepath, numpy_enabled, monkeypatch):
+    import threading
+
+    monkeypatch.setattr(Array, "RESERVE_BYTES", 0)
+    done = threading.Event()
+    errors = []
+
+    with Array("bit", temp_filepath, "w+b") as bits:
+        bits.append(True)
+
+        def reader():
+            try:
+                while not done.is_set():
+                    assert bits[0 : len(bits)][0]
+                    assert True in bits
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        try:
+            for _ in range(200):
+                bits.extend([False] * 1000)
+        finally:
+            done.set()
+            thread.join()
+
+        assert errors == []
+        assert len(bits) == 200_001
+
+
+@pytest.mark.parametrize("position", [0, 63, 64, 200, 999, 1003])
+def test_contains_in_blocks(temp_filepath, monkeypatch, position):
+    monkeypatch.setattr(BitArray, "SCAN_BLOCK_BYTES", 8)
+    monkeypatch.setattr(Array, "ADVISE_MIN_BYTES", 0)
+    with Array("bit", temp_filepath, "w+b") as bits:
+        bits.extend([False] * 1004)
+        assert True not in bits
+        bits[position] = True
+        assert True in bits
+        assert False in bits
+
+        bits[:] = [True] * 1004
+        assert False not in bits
+        bits[position] = False
+        assert False in bits
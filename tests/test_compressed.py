@@ -0,0 +1,164 @@
+import os
+
+import pytest
+
+from arrayfile import Array, CompressedArray
+
+pytest.importorskip("blosc")
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # 16 "i" elements per chunk, so tests cover several chunks cheaply
+    monkeypatch.setattr(CompressedArray, "CHUNK_BYTES", 64)
+
+
+def test_compressed_flag_gives_compressed_array(temp_filepath):
+    with Array("i", temp_filepath, "w+b", compressed=True) as array:
+        assert isinstance(array, CompressedArray)
+    with pytest.raises(ValueError, match="can't be compressed"):
+        Array("bit", temp_filepath, "w+b", compressed=True)
+    with pytest.raises(ValueError, match="Unknown bulk_mode 'bogus'"):
+        Array("i", temp_filepath, "w+b", bulk_mode="bogus", compressed=True)
+
+
+def test_append_and_read_across_chunks(temp_filepath, small_chunks):
+    with Array("i", temp_filepath, "w+b", compressed=True) as array:
+        for i in range(50):
+            array.append(i)
+        assert len(array) == 50
+        assert len(array._chunks) == 3
+        assert array[0] == 0
+        assert array[17] == 17
+        assert array[-1] == 49
+        assert list(array) == list(range(50))
+        with pytest.raises(IndexError):
+            _ = array[50]
+
+
+def test_persistence(temp_filepath, small_chunks):
+    with Array("d", temp_filepath, "w+b", compressed=True) as array:
+        array.extend([i / 2 for i in range(40)])
+
+    with Array("d", temp_filepath, "r+b", compressed=True) as array:
+        assert len(array) == 40
+        assert list(array) == [i / 2 for i in range(40)]
+        array.extend([100.0] * 30)
+
+    with Array("d", temp_filepath, "r+b", compressed=True) as array:
+        assert list(array) == [i / 2 for i in range(40)] + [100.0] * 30
+
+
+def test_compresses(temp_filepath):
+    with Array("q", temp_filepath, "w+b", compressed=True) as array:
+        array.extend([7] * 100_000)
+    assert os.path.getsize(temp_filepath) < 100_000
+
+
+def test_not_readable_as_plain_array(temp_filepath):
+    with Array("i", temp_filepath, "w+b", compressed=True) as array:
+        array.append(1)
+    with pytest.raises(ValueError, match="valid array header"):
+        Array("i", temp_filepath, "r+b")
+
+
+def test_slices_and_contains(temp_filepath, small_chunks):
+    values = list(range(40))
+    with Array("i", temp_filepath, "w+b", compressed=True) as array:
+        array.extend(values)
+        assert list(array[10:30:3]) == values[10:30:3]
+        assert list(array[::-7]) == values[::-7]
+        assert 33 in array
+        assert 40 not in array
+
+
+def test_only_tail_is_writable(temp_filepath, small_chunks):
+    with Array("i", temp_filepath, "w+b", compressed=True) as array:
+        array.extend(range(20))
+        array[19] = 100
+        array[-2:] = [1, 2]
+        assert list(array[18:]) == [1, 2]
+        with pytest.raises(TypeError, match="can't be changed"):
+            array[0] = 5
+        with pytest.raises(TypeError, match="cannot be packed"):
+            array.append("x")
+        with pytest.raises(TypeError, match="without copying"):
+            array.asarray()
+
+
+def test_imul(temp_filepath, small_chunks):
+    with Array("h", temp_filepath, "w+b", compressed=True) as array:
+        array.extend(range(10))
+        array *= 5
+        assert list(array) == list(range(10)) * 5
+        array *= 0
+        assert len(array) == 0
+        array.append(3)
+        assert list(array) == [3]
+
+
+def test_read_after_close(temp_filepath, small_chunks):
+    array = Array("i", temp_filepath, "w+b", compressed=True)
+    array.extend(range(20))
+    array.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        _ = array[0]
+
+
+def test_extend_from_generator(temp_filepath, small_chunks, monkeypatch):
+    monkeypatch.setattr(Array, "EXTEND_BATCH_ELEMENTS", 7)
+    with Array("i", temp_filepath, "w+b", compressed=True) as array:
+        array.extend(i for i in range(100))
+        assert list(array) == list(range(100))
+
+
+def test_string_dtype(temp_filepath, small_chunks):
+    values = [bytes([i % 26 + 97]) for i in range(100)]
+    with Array("s", temp_filepath, "w+b", compressed=True) as array:
+        array.extend(values)
+        assert list(array) == values
+        assert list(array[10:20]) == values[10:20]
+
+
+def test_opening_leaves_short_chunk_in_file(temp_filepath, small_chunks):
+    with Array("i", temp_filepath, "w+b", compressed=True) as array:
+        array.extend(range(20))
+    with open(temp_filepath, "rb") as f:
+        contents = f.read()
+
+    # Opened and dropped without close(), as if the process died
+    array = Array("i", temp_filepath, "r+b", compressed=True)
+    assert list(array) == list(range(20))
+    array._finalizer.detach()
+    array._file.close()
+    with open(temp_filepath, "rb") as f:
+        assert f.read() == contents
+
+    # Sealing over the short chunk with a different one leaves no trailing bytes
+    with Array("i", temp_filepath, "r+b", compressed=True) as array:
+        array.extend([7] * 100)
+    with Array("i", temp_filepath, "r+b", compressed=True) as array:
+        assert list(array) == list(range(20)) + [7] * 100
+
+
+def test_failed_seal_keeps_chunks_and_tail_consistent(temp_filepath, small_chunks, monkeypatch):
+    with Array("i", temp_filepath, "w+b", compressed=True) as array:
+        seal = array._seal
+        calls = []
+
+        def failing_seal(data):
+            calls.append(len(calls))
+            if len(calls) == 2:
+                raise OSError(28, "No space left on device")
+            seal(data)
+
+        monkeypatch.setattr(array, "_seal", failing_seal)
+        with pytest.raises(OSError):
+            array.extend(range(40))
+        assert len(array) == 40
+        assert len(array._chunks) == 1
+        assert list(array) == list(range(40))
+
+        array.append(40)
+        assert len(array._chunks) == 2
+        assert list(array) == list(range(41))
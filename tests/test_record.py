@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+from arrayfile import RecordArray
+
+
+def test_temporary_records():
+    with RecordArray("i,d") as records:
+        records.append((1, 0.5))
+        records.extend([(2, 1.5), (3, 2.5)])
+        assert len(records) == 3
+        assert records[0] == (1, 0.5)
+        assert records[-1] == (3, 2.5)
+        assert list(records) == [(1, 0.5), (2, 1.5), (3, 2.5)]
+        assert records.names == ("f0", "f1")
+
+
+def test_fields_are_stored_in_separate_files(temp_filepath):
+    with RecordArray("f,f", temp_filepath, "w+b", names=("x", "y")) as records:
+        records.extend([(1.0, 2.0), (3.0, 4.0)])
+
+    assert os.path.getsize(f"{temp_filepath}.0") == os.path.getsize(f"{temp_filepath}.1")
+
+    with RecordArray("f,f", temp_filepath, "r+b", names=("x", "y")) as records:
+        assert list(records) == [(1.0, 2.0), (3.0, 4.0)]
+
+
+def test_setitem_and_contains():
+    with RecordArray("i,h") as records:
+        records.extend([(1, 2), (3, 4)])
+        records[1] = (5, 6)
+        assert records[1] == (5, 6)
+        assert (5, 6) in records
+        assert (3, 4) not in records
+        assert (1,) not in records
+        assert 1 not in records
+
+
+def test_slices_are_per_field():
+    with RecordArray("i,i") as records:
+        records.extend([(i, -i) for i in range(5)])
+        xs, ys = records[1:3]
+        assert list(xs) == [1, 2]
+        assert list(ys) == [-1, -2]
+
+        records[0:2] = ([10, 11], [-10, -11])
+        assert records[0] == (10, -10)
+        assert records[1] == (11, -11)
+
+
+def test_field_view():
+    pytest.importorskip("numpy")
+    with RecordArray("f,d", names=("x", "y")) as records:
+        records.extend([(1.0, 2.0), (3.0, 4.0)])
+        x = records.field("x")
+        assert x.tolist() == [1.0, 3.0]
+        x[0] = 5.0
+        del x
+        assert records[0] == (5.0, 2.0)
+        with pytest.raises(KeyError):
+            records.field("z")
+
+
+def test_wrong_record_size():
+    with RecordArray("i,i") as records:
+        with pytest.raises(ValueError, match="Record has 3 values, expected 2"):
+            records.append((1, 2, 3))
+        assert len(records) == 0
+
+
+def test_failed_extend_keeps_fields_aligned():
+    with RecordArray("i,i") as records:
+        records.append((1, 2))
+        with pytest.raises(TypeError, match="cannot be packed"):
+            records.extend([(3, 4), (5, "six")])
+        assert len(records) == 1
+        records.append((7, 8))
+        assert list(records) == [(1, 2), (7, 8)]
+
+
+def test_invalid_names():
+    with pytest.raises(ValueError, match="Got 1 names for 2 fields"):
+        RecordArray("i,i", names=("x",))
+    with pytest.raises(ValueError, match="unique"):
+        RecordArray("i,i", names=("x", "x"))
+
+
+def test_mismatched_field_files(temp_filepath):
+    with RecordArray("i,i", temp_filepath, "w+b") as records:
+        records.extend([(1, 2), (3, 4)])
+        records._fields[1].append(5)
+
+    with pytest.raises(ValueError, match="different lengths"):
+        RecordArray("i,i", temp_filepath, "r+b")
+
+
+def test_failed_batched_extend_keeps_fields_aligned(monkeypatch):
+    from arrayfile import Array
+
+    monkeypatch.setattr(Array, "EXTEND_BATCH_ELEMENTS", 2)
+    with RecordArray("i,i") as records:
+        with pytest.raises(TypeError, match="cannot be packed"):
+            records.extend([(i, i) for i in range(5)] + [("x", 0)])
+        assert len(records) == 0
+        assert [len(field) for field in records._fields] == [0, 0]